@@ -1,13 +1,21 @@
 """Configuration management using python-dotenv"""
 
-import json
 import os
+import time
+from datetime import datetime
 from datetime import time as dt_time
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
+import orjson
 from dotenv import load_dotenv
 
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8
+    from backports.zoneinfo import ZoneInfo
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -22,14 +30,15 @@ def get_settings() -> Dict[str, Any]:
         )
 
     try:
-        with open(settings_path, encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        with open(settings_path, "rb") as f:
+            return orjson.loads(f.read())
+    except orjson.JSONDecodeError as e:
         raise ValueError(
             f"settings.json has invalid JSON syntax at {settings_path}. Error: {e}"
         ) from e
 
 
+@lru_cache(maxsize=1)
 def get_runpod_api_key() -> str:
     """Get RunPod API key from environment"""
     api_key = os.getenv("RUNPOD_API_KEY")
@@ -38,6 +47,7 @@ def get_runpod_api_key() -> str:
     return api_key
 
 
+@lru_cache(maxsize=1)
 def get_slack_bot_token() -> str:
     """Get Slack Bot Token from environment variables"""
     bot_token = os.getenv("SLACK_BOT_TOKEN")
@@ -46,12 +56,20 @@ def get_slack_bot_token() -> str:
     return bot_token
 
 
+@lru_cache(maxsize=1)
 def get_slack_mention_user() -> str:
     """Get Slack mention user from environment variables"""
     mention_user = os.getenv("SLACK_MENTION_USER", "Seungwoo Ryu")
     return mention_user
 
 
+@lru_cache(maxsize=1)
+def get_max_concurrent_http() -> int:
+    """Get the cap on concurrent RunPod HTTP calls across the scheduler process"""
+    return int(os.getenv("MAX_CONCURRENT_HTTP", "32"))
+
+
+@lru_cache(maxsize=1)
 def get_slack_config() -> Dict[str, Any]:
     """Get Slack configuration from environment variables"""
     webhook_url = os.getenv("SLACK_WEBHOOK_URL")
@@ -70,6 +88,14 @@ def get_slack_config() -> Dict[str, Any]:
     }
 
 
+def refresh_slack_config() -> None:
+    """Re-read .env and drop the cached Slack settings"""
+    load_dotenv(override=True)
+    get_slack_config.cache_clear()
+    get_slack_bot_token.cache_clear()
+    get_slack_mention_user.cache_clear()
+
+
 # Load settings once when module is imported
 SETTINGS = get_settings()
 UI_SETTINGS = SETTINGS["ui"]
@@ -82,14 +108,16 @@ DEFAULT_TO_TIME = dt_time(*map(int, UI_SETTINGS["default_to_time"].split(":")))
 DEFAULT_INTERVAL = UI_SETTINGS["default_interval"]
 AUTO_REFRESH_SECONDS = UI_SETTINGS["auto_refresh_seconds"]
 DEFAULT_TIMEZONE = UI_SETTINGS.get("timezone", "Asia/Seoul")
+TZ = ZoneInfo(DEFAULT_TIMEZONE)
+
+# Abbreviation only changes at DST boundaries, so recompute at most hourly
+_TZ_ABBR_CACHE: Dict[str, Any] = {"hour": None, "abbr": ""}
 
 
 def get_timezone_abbreviation() -> str:
     """Get timezone abbreviation for display purposes"""
-    from datetime import datetime
-
-    import pytz
-
-    tz = pytz.timezone(DEFAULT_TIMEZONE)
-    now = datetime.now(tz)
-    return now.strftime("%Z")
+    hour = int(time.time() // 3600)
+    if _TZ_ABBR_CACHE["hour"] != hour:
+        _TZ_ABBR_CACHE["abbr"] = datetime.now(TZ).strftime("%Z")
+        _TZ_ABBR_CACHE["hour"] = hour
+    return _TZ_ABBR_CACHE["abbr"]
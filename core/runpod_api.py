@@ -1,107 +1,184 @@
-"""Simple RunPod API client using requests"""
+"""Simple RunPod API client using requests (sync) and aiohttp (async)"""
 
 from datetime import datetime
-from typing import Any, Dict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-import pytz
 import requests
+from requests.adapters import HTTPAdapter
 
-from .env_settings import DEFAULT_TIMEZONE, get_runpod_api_key
+from .env_settings import TZ, get_runpod_api_key
+from .scheduler_manager import get_active_models, update_model_status
 
+if TYPE_CHECKING:
+    # aiohttp is slow to import; the sync paths and idle ticks never need it
+    import aiohttp
 
-def make_runpod_request(
-    target_url: str, model_name: str, message: str = "API CALL TEST"
+# Shared session so keep-alive connections (and TLS) to RunPod are reused
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+# Fields shared by every chat completions request body
+_BODY_TEMPLATE: Dict[str, Any] = {"temperature": 0.9}
+_BEARER_PREFIX = "Bearer "
+
+
+@lru_cache(maxsize=1)
+def _request_headers() -> Dict[str, str]:
+    """Build the headers sent with every RunPod request (once per process)"""
+    api_key = get_runpod_api_key()
+    # Accept keys stored with or without the scheme, but only strip a leading one
+    if api_key.startswith(_BEARER_PREFIX):
+        api_key = api_key[len(_BEARER_PREFIX) :]
+    return {
+        "Content-Type": "application/json",
+        "Authorization": f"{_BEARER_PREFIX}{api_key}",
+    }
+
+
+def _get_session() -> requests.Session:
+    """Return the shared session, attaching the RunPod headers on first use"""
+    if "Authorization" not in _SESSION.headers:
+        _SESSION.headers.update(_request_headers())
+    return _SESSION
+
+
+def _build_request_data(model_name: str, message: str) -> Dict[str, Any]:
+    """Build the chat completions request body"""
+    return {
+        **_BODY_TEMPLATE,
+        "model": model_name,
+        "messages": [{"role": "user", "content": message}],
+    }
+
+
+def _base_result(
+    success: bool, target_url: str, model_name: str, message: str
 ) -> Dict[str, Any]:
-    """Make a request to RunPod OpenAI chat completions API"""
+    """Build the fields shared by every request result"""
+    return {
+        "success": success,
+        "timestamp": datetime.now(TZ).isoformat(),
+        "model": model_name,
+        "target_url": target_url,
+        "message": message,
+    }
+
+
+def _update_testing_status(
+    model_name: str,
+    success: bool,
+    active_models: Optional[Dict[str, Dict[str, Any]]],
+    note: str = "",
+) -> None:
+    """Move a model out of "testing" once its first call has completed"""
+    new_status = "running" if success else "error"
     try:
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {get_runpod_api_key().replace('Bearer ', '')}",
-        }
+        if active_models is None:
+            active_models = get_active_models()
+        if (
+            model_name in active_models
+            and active_models[model_name].get("status") == "testing"
+        ):
+            update_model_status(model_name, new_status)
+            icon = "✅" if success else "❌"
+            print(f"{icon} Updated {model_name} status: testing → {new_status}{note}")
+    except Exception:
+        pass  # Don't fail the main function if status update fails
+
+
+def _handle_response(
+    target_url: str,
+    model_name: str,
+    message: str,
+    status_code: int,
+    text: str,
+    active_models: Optional[Dict[str, Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Build the result for a completed HTTP call and update model status"""
+    success = status_code == 200
+    result = _base_result(success, target_url, model_name, message)
+    if success:
+        result["response"] = text
+    else:
+        result["error"] = f"HTTP {status_code}: {text}"
+    result["status_code"] = status_code
+
+    _update_testing_status(model_name, success, active_models)
+
+    print(f"Request {'successful' if success else 'failed'} for {model_name}")
+    return result
+
+
+def _handle_exception(
+    target_url: str,
+    model_name: str,
+    message: str,
+    e: Exception,
+    active_models: Optional[Dict[str, Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Build the result for a call that raised and update model status"""
+    result = _base_result(False, target_url, model_name, message)
+    result["error"] = str(e)
+    result["error_type"] = type(e).__name__
 
-        data = {
-            "model": model_name,
-            "messages": [{"role": "user", "content": message}],
-            "temperature": 0.9,
-        }
+    _update_testing_status(model_name, False, active_models, " (exception)")
 
-        print(f"Making request to {target_url} with model {model_name}")
+    print(f"Request failed for {model_name}: {str(e)}")
+    return result
 
-        response = requests.post(target_url, headers=headers, json=data, timeout=600)
 
-        if response.status_code == 200:
-            result = {
-                "success": True,
-                "timestamp": datetime.now(pytz.timezone(DEFAULT_TIMEZONE)).isoformat(),
-                "model": model_name,
-                "target_url": target_url,
-                "message": message,
-                "response": response.text,
-                "status_code": response.status_code,
-            }
+def make_runpod_request(
+    target_url: str,
+    model_name: str,
+    message: str = "API CALL TEST",
+    active_models: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Make a request to RunPod OpenAI chat completions API
 
-            # Update model status to "running" on first successful call
-            from .scheduler_manager import get_active_models, update_model_status
+    ``active_models`` lets callers that already loaded the scheduler config
+    pass it in, so the status check does not read the config file again.
+    """
+    try:
+        session = _get_session()
+        data = _build_request_data(model_name, message)
 
-            active_models = get_active_models()
-            if (
-                model_name in active_models
-                and active_models[model_name].get("status") == "testing"
-            ):
-                update_model_status(model_name, "running")
-                print(f"✅ Updated {model_name} status: testing → running")
-
-        else:
-            result = {
-                "success": False,
-                "timestamp": datetime.now(pytz.timezone(DEFAULT_TIMEZONE)).isoformat(),
-                "model": model_name,
-                "target_url": target_url,
-                "message": message,
-                "error": f"HTTP {response.status_code}: {response.text}",
-                "status_code": response.status_code,
-            }
-
-            # Update model status to "error" on failed call
-            from .scheduler_manager import get_active_models, update_model_status
+        print(f"Making request to {target_url} with model {model_name}")
 
-            active_models = get_active_models()
-            if (
-                model_name in active_models
-                and active_models[model_name].get("status") == "testing"
-            ):
-                update_model_status(model_name, "error")
-                print(f"❌ Updated {model_name} status: testing → error")
-
-        print(
-            f"Request {'successful' if result['success'] else 'failed'} for {model_name}"
+        response = session.post(target_url, json=data, timeout=600)
+        return _handle_response(
+            target_url,
+            model_name,
+            message,
+            response.status_code,
+            response.text,
+            active_models,
         )
-        return result
 
     except Exception as e:
-        result = {
-            "success": False,
-            "timestamp": datetime.now(pytz.timezone(DEFAULT_TIMEZONE)).isoformat(),
-            "model": model_name,
-            "target_url": target_url,
-            "message": message,
-            "error": str(e),
-            "error_type": type(e).__name__,
-        }
-
-        # Update model status to "error" on exception
-        try:
-            from .scheduler_manager import get_active_models, update_model_status
+        return _handle_exception(target_url, model_name, message, e, active_models)
 
-            active_models = get_active_models()
-            if (
-                model_name in active_models
-                and active_models[model_name].get("status") == "testing"
-            ):
-                update_model_status(model_name, "error")
-                print(f"❌ Updated {model_name} status: testing → error (exception)")
-        except Exception:
-            pass  # Don't fail the main function if status update fails
-
-        print(f"Request failed for {model_name}: {str(e)}")
-        return result
+
+async def make_runpod_request_async(
+    session: "aiohttp.ClientSession",
+    target_url: str,
+    model_name: str,
+    message: str = "API CALL TEST",
+    active_models: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Async variant of make_runpod_request using a caller-owned aiohttp session"""
+    try:
+        data = _build_request_data(model_name, message)
+
+        print(f"Making request to {target_url} with model {model_name}")
+
+        async with session.post(
+            target_url, headers=_request_headers(), json=data
+        ) as response:
+            text = await response.text()
+        return _handle_response(
+            target_url, model_name, message, response.status, text, active_models
+        )
+
+    except Exception as e:
+        return _handle_exception(target_url, model_name, message, e, active_models)
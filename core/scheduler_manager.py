@@ -1,55 +1,131 @@
 """Simple configuration management"""
 
-import json
+import copy
 import os
+import tempfile
+import threading
+from contextlib import suppress
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
-import pytz
+import orjson
 
-from .env_settings import DEFAULT_TIMEZONE
+from .env_settings import TZ
 
 CONFIG_FILE = "config/scheduler_config.json"
 
+# Parsed config cached per process, invalidated when the file's mtime changes
+_CACHE: Dict[str, Any] = {"mtime": None, "data": {}}
+# Reentrant so read-modify-write helpers can hold it across load/save
+_CACHE_LOCK = threading.RLock()
+# Status changes held in memory until flush_config() writes them in one go
+_PENDING_WRITES: Dict[str, Dict[str, Any]] = {}
+# Read once at import: os.umask() can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _cached_config() -> Dict[str, Any]:
+    """Shared parsed config, re-read when the file changes
+
+    The returned dict is the cache itself: callers must hold _CACHE_LOCK while
+    reading it and never modify it (changes go through save_config()).
+    """
+    with _CACHE_LOCK:
+        try:
+            mtime = os.stat(CONFIG_FILE).st_mtime_ns
+        except OSError:
+            _CACHE["mtime"], _CACHE["data"] = None, {}
+            return {}
+
+        if mtime == _CACHE["mtime"]:
+            return _CACHE["data"]
+
+        try:
+            with open(CONFIG_FILE, "rb") as f:
+                data = orjson.loads(f.read())
+        except (FileNotFoundError, orjson.JSONDecodeError, PermissionError):
+            return {}
+
+        _CACHE["mtime"], _CACHE["data"] = mtime, data
+        return data
+
 
 def load_config() -> Dict[str, Any]:
-    """Load configuration from JSON file"""
-    if not os.path.exists(CONFIG_FILE):
-        return {}
+    """Load configuration from JSON file (cached until the file changes)
 
-    try:
-        with open(CONFIG_FILE, encoding="utf-8") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, PermissionError):
-        return {}
+    Returns a private copy, so callers may edit it and pass it to save_config().
+    """
+    with _CACHE_LOCK:
+        return copy.deepcopy(_cached_config())
 
 
 def save_config(config: Dict[str, Any]) -> bool:
-    """Save configuration to JSON file"""
-    try:
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
-        return True
-    except (OSError, json.JSONEncodeError, PermissionError):
-        return False
-
+    """Save configuration to JSON file
 
-def get_active_models() -> Dict[str, Dict[str, Any]]:
-    """Get all active model configurations"""
-    config = load_config()
+    Each write goes to its own temporary sibling that is then renamed into
+    place, so readers never see a partially written config and concurrent
+    writers (UI and scheduler) cannot truncate each other's file.
+    """
+    config_dir = os.path.dirname(CONFIG_FILE) or "."
+    try:
+        mode = os.stat(CONFIG_FILE).st_mode & 0o7777
+    except OSError:
+        mode = 0o666 & ~_UMASK  # What open() would have created
+    with _CACHE_LOCK:
+        tmp_file = None
+        try:
+            fd, tmp_file = tempfile.mkstemp(
+                dir=config_dir,
+                prefix=f"{os.path.basename(CONFIG_FILE)}.",
+                suffix=".tmp",
+            )
+            with os.fdopen(fd, "wb") as f:
+                # mkstemp creates 0600; keep the config's own permissions
+                os.fchmod(f.fileno(), mode)
+                f.write(
+                    orjson.dumps(
+                        config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                    )
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, CONFIG_FILE)
+            tmp_file = None
+            _CACHE["mtime"] = os.stat(CONFIG_FILE).st_mtime_ns
+            _CACHE["data"] = config
+            return True
+        except (OSError, orjson.JSONEncodeError):
+            # Force the next load to re-read whatever actually landed on disk
+            _CACHE["mtime"] = None
+            return False
+        finally:
+            if tmp_file is not None:
+                with suppress(OSError):
+                    os.unlink(tmp_file)
+
+
+def _active_models(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Copy the active model configurations out of an already loaded config"""
     models = config.get("models", {})
     return {
-        name: model_config
+        name: dict(model_config)
         for name, model_config in models.items()
         if model_config.get("active", False)
     }
 
 
+def get_active_models() -> Dict[str, Dict[str, Any]]:
+    """Get all active model configurations"""
+    with _CACHE_LOCK:
+        return _active_models(_cached_config())
+
+
 def get_model_config(model_name: str) -> Optional[Dict[str, Any]]:
     """Get configuration for a specific model"""
-    config = load_config()
-    models = config.get("models", {})
-    return models.get(model_name)
+    with _CACHE_LOCK:
+        model_config = _cached_config().get("models", {}).get(model_name)
+        return dict(model_config) if model_config is not None else None
 
 
 def set_model_config(
@@ -62,44 +138,80 @@ def set_model_config(
     status: str = "running",
 ) -> bool:
     """Set configuration for a model"""
-    config = load_config()
-
-    if "models" not in config:
-        config["models"] = {}
-
-    config["models"][model_name] = {
-        "target_url": target_url,
-        "from_time": from_time,
-        "to_time": to_time,
-        "interval_minutes": interval_minutes,
-        "active": active,
-        "status": status,  # "testing", "running", "stopped"
-        "last_updated": datetime.now(pytz.timezone(DEFAULT_TIMEZONE)).isoformat(),
-    }
+    with _CACHE_LOCK:
+        config = load_config()
+        _PENDING_WRITES.pop(model_name, None)
+
+        if "models" not in config:
+            config["models"] = {}
+
+        config["models"][model_name] = {
+            "target_url": target_url,
+            "from_time": from_time,
+            "to_time": to_time,
+            "interval_minutes": interval_minutes,
+            "active": active,
+            "status": status,  # "testing", "running", "stopped"
+            "last_updated": datetime.now(TZ).isoformat(),
+        }
+
+        return save_config(config)
 
-    return save_config(config)
 
+def deactivate_model(model_name: str) -> Tuple[bool, Dict[str, Dict[str, Any]]]:
+    """Deactivate scheduling for a model
 
-def deactivate_model(model_name: str) -> bool:
-    """Deactivate scheduling for a model"""
-    config = load_config()
-    if "models" in config and model_name in config["models"]:
-        config["models"][model_name]["active"] = False
-        config["models"][model_name]["status"] = "stopped"
-        config["models"][model_name]["last_updated"] = datetime.now(
-            pytz.timezone(DEFAULT_TIMEZONE)
-        ).isoformat()
-        return save_config(config)
-    return False
+    Returns whether the change was saved, along with the models still active
+    afterwards so callers do not have to load the config again.
+    """
+    with _CACHE_LOCK:
+        config = load_config()
+        _PENDING_WRITES.pop(model_name, None)
+        if "models" in config and model_name in config["models"]:
+            config["models"][model_name]["active"] = False
+            config["models"][model_name]["status"] = "stopped"
+            config["models"][model_name]["last_updated"] = datetime.now(TZ).isoformat()
+            return save_config(config), _active_models(config)
+        return False, _active_models(config)
 
 
 def update_model_status(model_name: str, status: str) -> bool:
-    """Update status of a model (testing -> running)"""
-    config = load_config()
-    if "models" in config and model_name in config["models"]:
-        config["models"][model_name]["status"] = status
-        config["models"][model_name]["last_updated"] = datetime.now(
-            pytz.timezone(DEFAULT_TIMEZONE)
-        ).isoformat()
-        return save_config(config)
-    return False
+    """Update status of a model (testing -> running)
+
+    The change is applied to the in-memory config right away but is only
+    written to disk by the next flush_config() call.
+    """
+    with _CACHE_LOCK:
+        config = load_config()
+        if "models" in config and model_name in config["models"]:
+            fields = {"status": status, "last_updated": datetime.now(TZ).isoformat()}
+            config["models"][model_name].update(fields)
+            # Swap the edited copy in; the file itself is untouched until flush
+            _CACHE["data"] = config
+            _PENDING_WRITES.setdefault(model_name, {}).update(fields)
+            return True
+        return False
+
+
+def flush_config() -> bool:
+    """Write pending status updates to disk with a single save"""
+    with _CACHE_LOCK:
+        if not _PENDING_WRITES:
+            return True
+
+        # Re-load so changes made by other processes since are kept
+        config = load_config()
+        if "models" not in config:
+            # Unreadable or empty config: never overwrite the file with the
+            # empty fallback, keep the updates for the next flush instead
+            return False
+        models = config["models"]
+        for model_name, fields in _PENDING_WRITES.items():
+            # Skip models that were stopped or removed in the meantime
+            if models.get(model_name, {}).get("active", False):
+                models[model_name].update(fields)
+
+        if not save_config(config):
+            return False
+        _PENDING_WRITES.clear()
+        return True
@@ -1,78 +1,301 @@
 #!/usr/bin/env python3
 """
-General RunPod Cronjob Script
-Reads active models from scheduler_config.json and processes them
+General RunPod Scheduler Script
+Reads active models from scheduler_config.json and processes them as they
+come due. Runs as a long-running process; pass --once for a single tick.
 """
 
-import json
+import asyncio
+import bisect
+import contextlib
+import fcntl
+import functools
+import heapq
 import os
+import pickle  # nosec B403 - only loads the sidecar cache this script writes
+import signal
 import sys
 import time
 import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from datetime import time as dt_time
 
-import pytz
-
 # Add script directory to path
-script_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, script_dir)
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PROJECT_ROOT)
 
 # Change to script directory for relative imports
-os.chdir(script_dir)
-
+os.chdir(PROJECT_ROOT)
+
+from core.env_settings import (  # noqa: E402
+    TZ,
+    get_max_concurrent_http,
+    get_timezone_abbreviation,
+)
+from core.runpod_api import make_runpod_request_async  # noqa: E402
+from core.scheduler_manager import (  # noqa: E402
+    CONFIG_FILE,
+    flush_config,
+    get_active_models,
+)
+from utils.cronjob_utils import (  # noqa: E402
+    get_scheduler_pid_file,
+    read_scheduler_pid,
+)
+from utils.slack_utils import (  # noqa: E402
+    queue_notification,
+    refresh_slack_settings,
+    send_failure_notification_with_thread,
+    send_mention_notification,
+    send_slack_notification_immediate,
+)
 
 MAX_ATTEMPTS = 4
 INTERVAL_MINUTES = 5
+REQUEST_TIMEOUT_SECONDS = 600
+MINUTES_PER_DAY = 24 * 60
+# Full tracebacks are costly under failure storms; opt in with DEBUG_TRACE=1
+DEBUG_TRACE = os.getenv("DEBUG_TRACE") == "1"
+# Parsed schedules keyed by (config path, mtime), mirrored to a sidecar pickle
+# so a fresh cron process skips the JSON parse when the config is unchanged
+CONFIG_PATH = os.path.join(PROJECT_ROOT, CONFIG_FILE)
+SCHEDULE_CACHE_FILE = os.path.join(PROJECT_ROOT, "config", "scheduler_config.cache.pkl")
+_SCHEDULE_CACHE = {}
+# Per-minute action flags in a model's tick table
+TICK_STARTUP = 1
+TICK_SHUTDOWN = 2
+TICK_RUN = 4
+# Upper bound on one scheduler sleep, so config edits are picked up even
+# without a SIGHUP and wall-clock jumps are corrected
+MAX_SLEEP_SECONDS = 300
+# Tries (0.1s apart) at the pid file lock before assuming a scheduler is running
+PID_LOCK_ATTEMPTS = 10
 
 
 def _time_prettify(time: datetime) -> str:
     """Format datetime object to readable string format"""
-    return time.strftime("%Y-%m-%d %H:%M")
+    return _format_minute(time.replace(second=0, microsecond=0))
+
+
+@functools.lru_cache(maxsize=8)
+def _format_minute(minute: datetime) -> str:
+    """strftime a minute-rounded datetime; call sites often repeat a minute"""
+    return minute.strftime("%Y-%m-%d %H:%M")
 
 
+@functools.lru_cache(maxsize=256)
 def _extract_endpoint_display(target_url: str) -> str:
     """Extract endpoint ID from RunPod URL for cleaner display"""
-    return (
-        target_url.split("/v2/")[1].split("/openai")[0]
-        if "/v2/" in target_url
-        else target_url
+    start = target_url.find("/v2/")
+    if start < 0:
+        return target_url
+    start += len("/v2/")
+    end = target_url.find("/openai", start)
+    return target_url[start:end] if end >= 0 else target_url[start:]
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_time(value: str) -> dt_time:
+    """Parse an ISO time string from the scheduler config"""
+    return dt_time.fromisoformat(value)
+
+
+def _parse_schedule(model_config):
+    """Return a copy of model_config with its time range as minutes of day"""
+    from_t = _parse_time(model_config.get("from_time", "07:30:00"))
+    to_t = _parse_time(model_config.get("to_time", "16:30:00"))
+    return {
+        **model_config,
+        "_from_mod": from_t.hour * 60 + from_t.minute,
+        "_to_mod": to_t.hour * 60 + to_t.minute,
+    }
+
+
+def _load_schedules():
+    """Load active models with parsed schedules, reusing them while unchanged"""
+    try:
+        cache_key = (CONFIG_PATH, os.stat(CONFIG_PATH).st_mtime_ns)
+    except OSError:
+        return []
+
+    if cache_key in _SCHEDULE_CACHE:
+        return _SCHEDULE_CACHE[cache_key]
+
+    try:
+        with open(SCHEDULE_CACHE_FILE, "rb") as f:
+            stored_key, schedules = pickle.load(f)  # nosec B301
+        if stored_key == cache_key:
+            _SCHEDULE_CACHE.clear()
+            _SCHEDULE_CACHE[cache_key] = schedules
+            return schedules
+    except Exception:
+        pass  # Missing or stale sidecar, fall back to parsing the JSON
+
+    schedules = [
+        (name, _parse_schedule(model_config))
+        for name, model_config in get_active_models().items()
+    ]
+    _SCHEDULE_CACHE.clear()
+    _SCHEDULE_CACHE[cache_key] = schedules
+
+    try:
+        tmp_file = f"{SCHEDULE_CACHE_FILE}.tmp"
+        with open(tmp_file, "wb") as f:
+            pickle.dump((cache_key, schedules), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, SCHEDULE_CACHE_FILE)
+    except OSError:
+        pass  # The sidecar is only an optimisation
+
+    return schedules
+
+
+@functools.lru_cache(maxsize=None)
+def _build_tick_table(from_mod: int, to_mod: int, interval_minutes: int):
+    """Map each minute of day with work to its TICK_* flags for one schedule
+
+    Calls are spaced every interval_minutes counting from from_time, also
+    across midnight for windows that wrap. Returns (table, sorted minutes);
+    identical schedules share the result.
+    """
+    span = (to_mod - from_mod) % MINUTES_PER_DAY
+    after_end = (to_mod + 1) % MINUTES_PER_DAY
+    table = {}
+    # Stepping the offset from from_time (not the minute of day) keeps the
+    # spacing even when interval_minutes does not divide a day
+    for offset in range(0, span + 1, max(interval_minutes, 1)):
+        table[(from_mod + offset) % MINUTES_PER_DAY] = TICK_RUN
+    table[from_mod] = table.get(from_mod, 0) | TICK_STARTUP
+    table[after_end] = table.get(after_end, 0) | TICK_SHUTDOWN
+    return table, tuple(sorted(table))
+
+
+def _prepare_model_config(model_config):
+    """Return a copy of a parsed model_config with its tick table attached"""
+    table, due_minutes = _build_tick_table(
+        model_config["_from_mod"],
+        model_config["_to_mod"],
+        model_config.get("interval_minutes", 30),
+    )
+    return {**model_config, "_tick_table": table, "_due_minutes": due_minutes}
+
+
+def _in_time_range(model_config, cur_mod):
+    """Whether cur_mod falls inside the model's from_time ~ to_time window"""
+    from_mod = model_config["_from_mod"]
+    # Offsets from from_time fold the wrap-around (e.g. 22:00~06:00) case in
+    return ((cur_mod - from_mod) % MINUTES_PER_DAY) <= (
+        (model_config["_to_mod"] - from_mod) % MINUTES_PER_DAY
     )
 
 
+def _wall_to_epoch(day, minute_of_day):
+    """Epoch at which the wall clock in TZ first reads this day and minute
+
+    A repeated (fall-back) minute maps to its first occurrence. A minute
+    skipped by a spring-forward gap maps to the first real minute after
+    the gap.
+    """
+    wall = datetime.combine(
+        day, dt_time(minute_of_day // 60, minute_of_day % 60), tzinfo=TZ
+    )
+    ts = int(wall.timestamp())
+    real = datetime.fromtimestamp(ts, TZ)
+    if (real.hour, real.minute) == (wall.hour, wall.minute):
+        return ts
+    # fold=1 resolves a gap minute to an instant before the gap; walk forward
+    # to the first minute whose wall time is past it
+    naive_wall = wall.replace(tzinfo=None)
+    ts = int(wall.replace(fold=1).timestamp())
+    while datetime.fromtimestamp(ts, TZ).replace(tzinfo=None) < naive_wall:
+        ts += 60
+    return ts
+
+
+def _next_due(model_config, after_ts):
+    """(epoch, minute of day) of the model's first due minute after after_ts
+
+    Each due minute is converted through TZ on its own day, so DST changes
+    while sleeping never shift a wake-up. A wall-clock minute runs at most
+    once a day. Minutes inside a spring-forward gap run at the end of the
+    gap, which is why the scheduled minute is returned alongside the epoch.
+    """
+    due_minutes = model_config["_due_minutes"]
+    first_ts = (int(after_ts) // 60 + 1) * 60
+    # Scan from the wall minute after the last real one: across a gap this is
+    # earlier than first_ts's own wall minute, so no skipped slot is missed
+    prev = datetime.fromtimestamp(first_ts - 60, TZ)
+    day = prev.date()
+    index = bisect.bisect_left(due_minutes, prev.hour * 60 + prev.minute + 1)
+    # Every table has a due minute each day; the extra day covers a day's
+    # slots all being passed already (e.g. the repeated fall-back hour)
+    for _ in range(3):
+        for minute_of_day in due_minutes[index:]:
+            ts = _wall_to_epoch(day, minute_of_day)
+            if ts >= first_ts:
+                return ts, minute_of_day
+        day = day.fromordinal(day.toordinal() + 1)
+        index = 0
+    raise ValueError("tick table has no due minutes")
+
+
 def send_slack_notification(message, is_success=True, message_type="regular"):
     """Send notification to Slack if configured"""
     try:
-        from utils.slack_utils import send_slack_notification_immediate
-
         send_slack_notification_immediate(message, is_success, message_type)
     except Exception as e:
         print(f"Slack notification error: {e}")
 
 
-def handle_cold_start(target_url, model_name, message, tz_abbr):
-    """Cold start handling with 4 attempts at 5-minute intervals"""
-    from core.env_settings import DEFAULT_TIMEZONE
-    from core.runpod_api import make_runpod_request
+def send_failure_notification(message, model_name):
+    """Send failure notification and a threaded mention for the failed model"""
+    # Send failure notification via Web API to get message timestamp
+    try:
+        # Send failure message and get timestamp for threading
+        message_ts = send_failure_notification_with_thread(message, model_name)
+
+        # Send mention notification as thread reply if we got timestamp.
+        # Sequential by necessity (it needs message_ts); it reuses the pooled
+        # keep-alive connection the failure post just used
+        if message_ts:
+            send_mention_notification(
+                context_message=f"API call failed for model: `{model_name}`",
+                thread_ts=message_ts,
+            )
+        else:
+            # Fallback to regular mention if timestamp not available
+            send_mention_notification(
+                context_message=f"API call failed for model: `{model_name}`"
+            )
+
+    except Exception as e:
+        print(f"Failed to send failure notification with thread: {e}")
 
-    tz = pytz.timezone(DEFAULT_TIMEZONE)
+
+async def handle_cold_start(
+    session, target_url, model_name, message, tz_abbr, active_models=None
+):
+    """Cold start handling with 4 attempts at 5-minute intervals"""
     print(f"Starting cold start sequence for {model_name}")
 
     for attempt in range(1, MAX_ATTEMPTS + 1):
         print(f"Cold start attempt {attempt}/{MAX_ATTEMPTS} for {model_name}")
 
-        attempt_start_time = datetime.now(tz)
-        result = make_runpod_request(target_url, model_name, message)
-        attempt_end_time = datetime.now(tz)
+        attempt_start_time = datetime.now(TZ)
+        result = await make_runpod_request_async(
+            session, target_url, model_name, message, active_models
+        )
+        attempt_end_time = datetime.now(TZ)
 
         if result.get("success", False):
             # Send success message immediately and exit
             endpoint_display = _extract_endpoint_display(target_url)
             success_message = f"🔥 *Cold Start Successful*\n\n*Model:* `{model_name}`\n*Attempt:* {attempt}/{MAX_ATTEMPTS}\n*Start Time:* {_time_prettify(attempt_start_time)} {tz_abbr}\n*Response Time:* {_time_prettify(attempt_end_time)} {tz_abbr}\n*Endpoint:* <{target_url}|{endpoint_display}>"
             print(f"Cold start successful on attempt {attempt} for {model_name}")
-            send_slack_notification(
-                success_message, is_success=True, message_type="coldstart"
+            queue_notification(
+                send_slack_notification,
+                success_message,
+                is_success=True,
+                message_type="coldstart",
             )
             return
         else:
@@ -81,242 +304,397 @@ def handle_cold_start(target_url, model_name, message, tz_abbr):
             # Wait 5 minutes if not the last attempt
             if attempt < MAX_ATTEMPTS:
                 print(f"Waiting {INTERVAL_MINUTES} minutes before next attempt...")
-                time.sleep(INTERVAL_MINUTES * 60)  # Wait 5 minutes
+                # Yields to the event loop so other models keep being served
+                await asyncio.sleep(INTERVAL_MINUTES * 60)  # Wait 5 minutes
 
     # Send failure message if all 4 attempts failed
-    final_failure_time = datetime.now(tz)
+    final_failure_time = datetime.now(TZ)
     endpoint_display = _extract_endpoint_display(target_url)
     failure_message = f"❄️ *Cold Start Failed*\n\n*Model:* `{model_name}`\n*Total Attempts:* {MAX_ATTEMPTS}\n*Final Attempt Time:* {_time_prettify(final_failure_time)} {tz_abbr}\n*Endpoint:* <{target_url}|{endpoint_display}>\n*Status:* All {MAX_ATTEMPTS} attempts failed"
     print(f"Cold start failed after {MAX_ATTEMPTS} attempts for {model_name}")
-    send_slack_notification(failure_message, is_success=False, message_type="coldstart")
+    queue_notification(
+        send_slack_notification,
+        failure_message,
+        is_success=False,
+        message_type="coldstart",
+    )
 
 
-def process_single_model(model_name, model_config, now, tz_abbr):
-    """Process a single model - designed for parallel execution"""
-    try:
-        from core.env_settings import DEFAULT_TIMEZONE
-        from core.runpod_api import make_runpod_request
+def _tick_strings(now):
+    """Timestamp strings shared by every message built for one tick"""
+    return {"date": now.strftime("%Y-%m-%d"), "min": _time_prettify(now)}
 
-        tz = pytz.timezone(DEFAULT_TIMEZONE)
 
+async def process_single_model(
+    session, model_name, model_config, now, tz_abbr, active_models=None, fmt=None
+):
+    """Process a single model - designed for concurrent execution"""
+    try:
         from_time = model_config.get("from_time", "07:30:00")
         to_time = model_config.get("to_time", "16:30:00")
         target_url = model_config.get("target_url", "")
         interval_minutes = model_config.get("interval_minutes", 30)
 
-        # Parse time range
-        from_t = dt_time.fromisoformat(from_time)
-        to_t = dt_time.fromisoformat(to_time)
-        current_t = now.time()
-
-        # Check if current time is within the specified range
-        in_time_range = (
-            (from_t <= current_t <= to_t)
-            if from_t <= to_t
-            else (current_t >= from_t or current_t <= to_t)
-        )
+        # One lookup decides everything this model has to do this minute
+        cur_mod = now.hour * 60 + now.minute
+        flags = model_config["_tick_table"].get(cur_mod, 0)
+        # Formatted once per tick by run_all and reused by every message
+        if fmt is None:
+            fmt = _tick_strings(now)
+        now_str = fmt["min"]
 
         # Check if this is exactly the start time (send startup notification + cold start)
-        if current_t.hour == from_t.hour and current_t.minute == from_t.minute:
-            start_date = now.strftime("%Y-%m-%d")
+        if flags & TICK_STARTUP:
+            start_date = fmt["date"]
             endpoint_display = _extract_endpoint_display(target_url)
             startup_message = f"*Daily operations started for {start_date}*\n\n*Model:* `{model_name}`\n*Endpoint:* <{target_url}|{endpoint_display}>\n*Schedule:* {from_time} ~ {to_time} {tz_abbr}\n*Interval:* Every {interval_minutes} minutes"
             print(f"Sending startup notification for {model_name}")
-            send_slack_notification(
-                startup_message, is_success=True, message_type="startup"
+            queue_notification(
+                send_slack_notification,
+                startup_message,
+                is_success=True,
+                message_type="startup",
             )
 
             # Cold start sequence for the first API call of the day
-            cold_start_message = (
-                f"Cold start sequence - {_time_prettify(now)} {tz_abbr}"
-            )
+            cold_start_message = f"Cold start sequence - {now_str} {tz_abbr}"
             print(f"Starting cold start sequence for {model_name}")
-            handle_cold_start(target_url, model_name, cold_start_message, tz_abbr)
+            await handle_cold_start(
+                session,
+                target_url,
+                model_name,
+                cold_start_message,
+                tz_abbr,
+                active_models,
+            )
             return f"Cold start completed for {model_name}"
 
         # Check if this is just after the end time (send termination notification once)
-        if (current_t.hour == to_t.hour and current_t.minute == to_t.minute + 1) or (
-            to_t.minute == 59
-            and current_t.hour == to_t.hour + 1
-            and current_t.minute == 0
-        ):
-            end_date = now.strftime("%Y-%m-%d")
+        if flags & TICK_SHUTDOWN:
+            end_date = fmt["date"]
             message = f"*Daily operation completed for {end_date}*\n\n*Model:* `{model_name}`\n*Schedule:* {from_time} ~ {to_time} {tz_abbr}\n*Next Start:* Tomorrow at {from_time} {tz_abbr}"
             print(f"Sending end-of-day notification for {model_name}")
-            send_slack_notification(message, is_success=True, message_type="shutdown")
+            queue_notification(
+                send_slack_notification,
+                message,
+                is_success=True,
+                message_type="shutdown",
+            )
 
-        if not in_time_range:
+        if not flags & TICK_RUN and not _in_time_range(model_config, cur_mod):
             print(f"Skipping {model_name} - outside time range {from_time} ~ {to_time}")
             return f"Skipped {model_name} - outside time range"
 
         # Check if it's time to run based on interval
-        current_minute = now.minute
-        if interval_minutes == 1:
-            should_run = True  # Run every minute
-        elif interval_minutes <= 60:
-            should_run = current_minute % interval_minutes == 0
-        else:
-            # For intervals > 60 minutes, check hour and minute
-            current_hour = now.hour
-            should_run = (
-                current_minute == 0 and current_hour % (interval_minutes // 60) == 0
-            )
-
-        if should_run:
-            # Record when cronjob scheduling started
-            scheduled_start_time = now
-            print(
-                f"Making API call for {model_name} at {_time_prettify(scheduled_start_time)}"
-            )
+        if flags & TICK_RUN:
+            print(f"Making API call for {model_name} at {now_str}")
 
-            result = make_runpod_request(
+            result = await make_runpod_request_async(
+                session,
                 target_url,
                 model_name,
-                f"Scheduled API call - {_time_prettify(scheduled_start_time)} {tz_abbr}",
+                f"Scheduled API call - {now_str} {tz_abbr}",
+                active_models,
             )
 
-            response_arrival_time = datetime.now(tz)
+            response_arrival_time = datetime.now(TZ)
 
             if result.get("success", False):
                 endpoint_display = _extract_endpoint_display(target_url)
-                message = f"*Scheduled Start Time:* {_time_prettify(scheduled_start_time)} {tz_abbr}\n*Response Arrival Time:* {_time_prettify(response_arrival_time)} {tz_abbr}\n*Model:* `{model_name}`\n*Endpoint:* <{target_url}|{endpoint_display}>\n*Schedule:* Every {interval_minutes} minutes ({from_time} ~ {to_time})"
+                message = f"*Scheduled Start Time:* {now_str} {tz_abbr}\n*Response Arrival Time:* {_time_prettify(response_arrival_time)} {tz_abbr}\n*Model:* `{model_name}`\n*Endpoint:* <{target_url}|{endpoint_display}>\n*Schedule:* Every {interval_minutes} minutes ({from_time} ~ {to_time})"
                 print("API call successful - sending Slack notification")
-                send_slack_notification(
-                    message, is_success=True, message_type="regular"
+                queue_notification(
+                    send_slack_notification,
+                    message,
+                    is_success=True,
+                    message_type="regular",
                 )
                 return f"API call successful for {model_name}"
             else:
                 endpoint_display = _extract_endpoint_display(target_url)
-                message = f"*Scheduled Start Time:* {_time_prettify(scheduled_start_time)} {tz_abbr}\n*Response Failure Time:* {_time_prettify(response_arrival_time)} {tz_abbr}\n*Model:* `{model_name}`\n*Endpoint:* <{target_url}|{endpoint_display}>\n*Error:* API call failed"
+                message = f"*Scheduled Start Time:* {now_str} {tz_abbr}\n*Response Failure Time:* {_time_prettify(response_arrival_time)} {tz_abbr}\n*Model:* `{model_name}`\n*Endpoint:* <{target_url}|{endpoint_display}>\n*Error:* API call failed"
                 print(
                     "API call failed - sending Slack notification via Web API for threading"
                 )
-
-                # Send failure notification via Web API to get message timestamp
-                try:
-                    from utils.slack_utils import (
-                        send_failure_notification_with_thread,
-                        send_mention_notification,
-                    )
-
-                    # Send failure message and get timestamp for threading
-                    message_ts = send_failure_notification_with_thread(
-                        message, model_name
-                    )
-
-                    # Send mention notification as thread reply if we got timestamp
-                    if message_ts:
-                        send_mention_notification(
-                            context_message=f"API call failed for model: `{model_name}`",
-                            thread_ts=message_ts,
-                        )
-                    else:
-                        # Fallback to regular mention if timestamp not available
-                        send_mention_notification(
-                            context_message=f"API call failed for model: `{model_name}`"
-                        )
-
-                except Exception as e:
-                    print(f"Failed to send failure notification with thread: {e}")
+                queue_notification(send_failure_notification, message, model_name)
 
                 return f"API call failed for {model_name}"
         else:
             print(
-                f"Skipping {model_name} - not scheduled to run this minute (interval: {interval_minutes} min, current: {current_minute})"
+                f"Skipping {model_name} - not scheduled to run this minute (interval: {interval_minutes} min, current: {now_str})"
             )
             return f"Skipped {model_name} - not scheduled"
 
     except Exception as e:
         error_msg = f"Error processing {model_name}: {e}"
         print(error_msg)
-        print(f"Traceback: {traceback.format_exc()}")
+        if DEBUG_TRACE:
+            print(f"Traceback: {traceback.format_exc()}")
         return error_msg
 
 
-def main():
-    try:
-        print(f"Script directory: {os.getcwd()}")
-        print(f"Python path: {sys.path[:3]}")  # Show first 3 entries
+def _create_session():
+    """Build the aiohttp session shared by every request of this process"""
+    # Imported here so idle --once ticks never pay for loading aiohttp
+    import aiohttp
+
+    # Bounded by RunPod rate limits, not by how many models are configured
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)
+    connector = aiohttp.TCPConnector(limit=get_max_concurrent_http(), ttl_dns_cache=300)
+    return aiohttp.ClientSession(timeout=timeout, connector=connector)
+
 
-        from core.env_settings import DEFAULT_TIMEZONE
+async def run_all(session, active_models, now, tz_abbr):
+    """Process all active models concurrently on a single event loop
 
-        tz = pytz.timezone(DEFAULT_TIMEZONE)
-        print(f"[{_time_prettify(datetime.now(tz))}] Starting cronjob execution...")
+    active_models maps names to prepared configs; it is also handed to the
+    workers so status checks don't re-read the config file.
+    """
+    fmt = _tick_strings(now)
 
-        print("Successfully imported make_runpod_request")
+    results = await asyncio.gather(
+        *(
+            process_single_model(
+                session, model_name, model_config, now, tz_abbr, active_models, fmt
+            )
+            for model_name, model_config in active_models.items()
+        ),
+        return_exceptions=True,
+    )
 
-        # Load active models from config
-        config_path = os.path.join(
-            os.path.dirname(__file__), "config/scheduler_config.json"
+    for model_name, result in zip(active_models, results):
+        if isinstance(result, BaseException):
+            print(f"Model {model_name} generated an exception: {result}")
+        else:
+            print(f"Model {model_name} processing result: {result}")
+
+
+async def run_tick(session, now, model_names=None):
+    """Process the active models (optionally only model_names) for one minute"""
+    tz_abbr = get_timezone_abbreviation()
+    print(f"Current time: {_time_prettify(now)} {tz_abbr}")
+
+    # Load active models through the cached scheduler config reader, in one pass
+    active_models = {}
+    for name, model_config in _load_schedules():
+        if model_names is None or name in model_names:
+            active_models[name] = _prepare_model_config(model_config)
+    print(f"Active models: {list(active_models)}")
+
+    # Process active models concurrently on one event loop
+    if active_models:
+        print(
+            f"Processing {len(active_models)} models with up to {get_max_concurrent_http()} concurrent connections"
         )
-        with open(config_path, encoding="utf-8") as f:
-            config = json.load(f)
 
-        from core.env_settings import get_timezone_abbreviation
+        await run_all(session, active_models, now, tz_abbr)
+
+        # Persist all status changes from this tick in one write
+        flush_config()
+    else:
+        print("No active models found")
+
 
-        now = datetime.now(tz)
+def _report_error(e):
+    """Log an unexpected scheduler error and report it to Slack"""
+    print(f"Exception occurred: {e}")
+    if DEBUG_TRACE:
+        print(f"Traceback: {traceback.format_exc()}")
+    try:
+        now_with_tz = datetime.now(TZ)
         tz_abbr = get_timezone_abbreviation()
-        print(f"Current time: {_time_prettify(now)} {tz_abbr}")
-
-        # Get active models using list comprehension
-        active_models = [
-            (name, config)
-            for name, config in config.get("models", {}).items()
-            if config.get("active", False)
-        ]
-        print(f"Active models: {[name for name, _ in active_models]}")
-
-        # Load settings to get total model count for thread pool sizing
-        settings_path = os.path.join(os.path.dirname(__file__), "config/settings.json")
-        try:
-            with open(settings_path, encoding="utf-8") as f:
-                settings = json.load(f)
-            total_models_count = len(settings.get("models", []))
-        except (FileNotFoundError, json.JSONDecodeError):
-            total_models_count = 10  # Fallback to 10 if settings file is not found
-
-        # Process active models in parallel using ThreadPoolExecutor
-        if active_models:
-            max_workers = min(
-                len(active_models), total_models_count
-            )  # Limit to total available models
-            print(
-                f"Processing {len(active_models)} models with {max_workers} workers (total models: {total_models_count})"
-            )
+        error_message = f"Serverless API call failed at {_time_prettify(now_with_tz)} {tz_abbr}\nError: {str(e)}"
+        send_slack_notification(error_message, is_success=False)
+    except Exception:
+        pass
 
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all model processing tasks
-                future_to_model = {
-                    executor.submit(
-                        process_single_model, model_name, model_config, now, tz_abbr
-                    ): model_name
-                    for model_name, model_config in active_models
-                }
-
-                # Process completed tasks as they finish
-                for future in as_completed(future_to_model):
-                    model_name = future_to_model[future]
-                    try:
-                        result = future.result()
-                        print(f"Model {model_name} processing result: {result}")
-                    except Exception as exc:
-                        print(f"Model {model_name} generated an exception: {exc}")
-        else:
-            print("No active models found")
 
+async def _dispatch(session, due_ts, due_mod, model_names):
+    """Run the scheduled minute due_mod for the models due at due_ts"""
+    try:
+        now = datetime.fromtimestamp(due_ts, TZ)
+        if now.hour * 60 + now.minute != due_mod:
+            # A minute skipped by DST keeps its own schedule flags
+            now = now.replace(hour=due_mod // 60, minute=due_mod % 60)
+        print(f"[{_time_prettify(now)}] Dispatching {sorted(model_names)}")
+        await run_tick(session, now, model_names)
     except Exception as e:
-        print(f"Exception occurred: {e}")
-        print(f"Traceback: {traceback.format_exc()}")
+        _report_error(e)
+
+
+def _build_heap(after_ts):
+    """Heap of (next_due_epoch, minute_of_day, model_name) for every active model"""
+    heap = []
+    for name, model_config in _load_schedules():
+        due_ts, due_mod = _next_due(_prepare_model_config(model_config), after_ts)
+        heap.append((due_ts, due_mod, name))
+    heapq.heapify(heap)
+    return heap
+
+
+async def scheduler_loop(pid_file=None):
+    """Sleep until the next model is due, dispatch it and reschedule it
+
+    The pid is only published once the signal handlers are installed, so a
+    SIGHUP from the UI can never hit the default (terminating) handler.
+    """
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+    requested = {"reload": False, "stop": False}
+
+    def _request(flag):
+        requested[flag] = True
+        wakeup.set()
+
+    # SIGHUP re-reads scheduler_config.json; SIGTERM exits cleanly
+    loop.add_signal_handler(signal.SIGHUP, _request, "reload")
+    loop.add_signal_handler(signal.SIGTERM, _request, "stop")
+    if pid_file is not None:
+        _publish_pid(pid_file)
+
+    tasks = set()
+    # Minutes up to here are handled; the current minute is still eligible
+    last_ts = (int(time.time()) // 60 - 1) * 60
+    schedules = _load_schedules()
+    heap = _build_heap(last_ts)
+    # One session for the whole process keeps TCP+TLS connections warm
+    session = _create_session()
+
+    try:
+        while not requested["stop"]:
+            current = _load_schedules()
+            if requested["reload"] or current is not schedules:
+                if requested["reload"]:
+                    # SIGHUP also picks up Slack settings edited in .env
+                    refresh_slack_settings()
+                requested["reload"] = False
+                schedules = current
+                heap = _build_heap(last_ts)
+                print(f"Scheduler reloaded: {len(heap)} active models")
+
+            delay = heap[0][0] - time.time() if heap else MAX_SLEEP_SECONDS
+            if delay > 0:
+                wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        wakeup.wait(), timeout=min(delay, MAX_SLEEP_SECONDS)
+                    )
+                continue
+
+            due_ts, due_mod = heap[0][:2]
+            names = set()
+            while heap and heap[0][:2] == (due_ts, due_mod):
+                names.add(heapq.heappop(heap)[2])
+            last_ts = due_ts
+
+            # A minute missed by more than its own length (e.g. suspend) is dropped
+            if time.time() - due_ts < 60:
+                # Cold starts run for minutes, so ticks overlap instead of queueing
+                task = asyncio.create_task(_dispatch(session, due_ts, due_mod, names))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            else:
+                print(f"Skipping stale tick for {sorted(names)}")
+
+            model_configs = dict(schedules)
+            for name in names & model_configs.keys():
+                next_due = _next_due(_prepare_model_config(model_configs[name]), due_ts)
+                heapq.heappush(heap, (*next_due, name))
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await session.close()
+        flush_config()
+
+
+def _lock_pid_file():
+    """Take the scheduler's pid file lock; None if another scheduler holds it"""
+    fd = os.open(get_scheduler_pid_file(), os.O_RDWR | os.O_CREAT, 0o644)
+    pid_file = os.fdopen(fd, "r+")
+    # read_scheduler_pid() holds a shared lock for an instant, so retry briefly
+    for _ in range(PID_LOCK_ATTEMPTS):
         try:
-            from core.env_settings import DEFAULT_TIMEZONE, get_timezone_abbreviation
-
-            tz = pytz.timezone(DEFAULT_TIMEZONE)
-            now_with_tz = datetime.now(tz)
-            tz_abbr = get_timezone_abbreviation()
-            error_message = f"Serverless API call failed at {_time_prettify(now_with_tz)} {tz_abbr}\nError: {str(e)}"
-            send_slack_notification(error_message, is_success=False)
-        except Exception:
-            pass
+            fcntl.flock(pid_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            break
+        except BlockingIOError:
+            time.sleep(0.1)
+    else:
+        pid_file.close()
+        print(f"Scheduler already running with pid {read_scheduler_pid()}")
+        return None
+    # Drop a stale pid right away; ours is written once signals are handled
+    pid_file.truncate(0)
+    return pid_file
+
+
+def _publish_pid(pid_file):
+    """Record this process in the locked pid file"""
+    pid_file.seek(0)
+    pid_file.write(str(os.getpid()))
+    pid_file.flush()
+
+
+def _release_pid_file(pid_file):
+    """Clear the pid and drop the lock
+
+    The file is emptied rather than removed, so a scheduler starting at the
+    same moment can never lock an unlinked copy of it.
+    """
+    with contextlib.suppress(OSError):
+        pid_file.truncate(0)
+    pid_file.close()
+
+
+async def _run_single_tick(now, model_names):
+    """run_tick with a session that lives for just this tick"""
+    async with _create_session() as session:
+        await run_tick(session, now, model_names)
+
+
+def run_once():
+    """Process a single minute for all active models and exit"""
+    try:
+        now = datetime.now(TZ)
+        print(f"[{_time_prettify(now)}] Starting cronjob execution...")
+
+        # Fast path: only start the event loop when some model has work now
+        cur_mod = now.hour * 60 + now.minute
+        due_models = {
+            name
+            for name, model_config in _load_schedules()
+            if _prepare_model_config(model_config)["_tick_table"].get(cur_mod)
+        }
+        if not due_models:
+            print("No models due this minute")
+            return
+
+        asyncio.run(_run_single_tick(now, due_models))
+    except Exception as e:
+        _report_error(e)
+
+
+def main():
+    print(f"Script directory: {os.getcwd()}")
+    print(f"Python path: {sys.path[:3]}")  # Show first 3 entries
+
+    if "--once" in sys.argv[1:]:
+        run_once()
+        return
+
+    # Output is redirected to the log file, flush it line by line
+    sys.stdout.reconfigure(line_buffering=True)
+    pid_file = _lock_pid_file()
+    if pid_file is None:
+        return
+    try:
+        print(f"[{_time_prettify(datetime.now(TZ))}] Starting scheduler...")
+        asyncio.run(scheduler_loop(pid_file))
+    except Exception as e:
+        _report_error(e)
+    finally:
+        _release_pid_file(pid_file)
+        print(f"[{_time_prettify(datetime.now(TZ))}] Scheduler stopped")
 
 
 if __name__ == "__main__":
@@ -1,13 +1,34 @@
 """Cronjob management utilities"""
 
+import fcntl
 import os
+import re
+import signal
 import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager, suppress
+from datetime import datetime
+from typing import List, Optional
+
+from core.env_settings import TZ, get_timezone_abbreviation
+from core.runpod_api import make_runpod_request
+from core.scheduler_manager import flush_config, get_model_config
+from utils.slack_utils import send_slack_notification_immediate
+
+# Resolved from this file rather than cwd so paths stay stable
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEDULER_PID_FILE = "runpod_scheduler.pid"
+SCHEDULER_PID_PATH = os.path.join(PROJECT_ROOT, SCHEDULER_PID_FILE)
+# Tag carried by every crontab line this project installs
+_RUNPOD_TAG_RE = re.compile(r"# runpod_")
+# Per-user, like the crontab it protects
+_CRON_LOCK_FILE = os.path.join(tempfile.gettempdir(), f"runpod_cron.{os.getuid()}.lock")
 
 
 def get_project_paths():
     """Get project paths for consistency"""
-    # Use file-based path resolution instead of cwd to ensure stability
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    project_root = PROJECT_ROOT
 
     # Try to use virtual environment python if available, fallback to system python
     venv_python = os.path.join(
@@ -23,44 +44,114 @@ def get_project_paths():
     return project_root, python_path
 
 
+def get_scheduler_pid_file() -> str:
+    """Path of the pid file written by the long-running scheduler"""
+    return SCHEDULER_PID_PATH
+
+
+def read_scheduler_pid() -> Optional[int]:
+    """Return the pid of the running scheduler, or None if it is not alive
+
+    The scheduler holds an exclusive flock on the pid file for its whole
+    lifetime, so a lock that can be taken means the recorded pid is stale
+    (crashed scheduler, zombie or reused pid) and must not be signalled.
+    """
+    try:
+        with open(get_scheduler_pid_file()) as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return int(f.read().strip())
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def ensure_scheduler_running(python_path: str, script_path: str, log_path: str):
+    """Start the scheduler if needed, otherwise ask it to reload its config"""
+    pid = read_scheduler_pid()
+    if pid is not None:
+        os.kill(pid, signal.SIGHUP)
+        return
+
+    # Detached from the Streamlit process so it survives UI restarts
+    with open(log_path, "a") as log_file:
+        subprocess.Popen(
+            [python_path, script_path],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+
+def stop_scheduler():
+    """Terminate the running scheduler, if any"""
+    pid = read_scheduler_pid()
+    if pid is not None:
+        os.kill(pid, signal.SIGTERM)
+
+
+@contextmanager
+def _crontab_lock():
+    """Serialize crontab read-modify-write cycles across processes"""
+    with open(_CRON_LOCK_FILE, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield  # Closing the file releases the lock
+
+
+def _read_crontab() -> Optional[str]:
+    """Return the current user crontab, or None if there is none"""
+    result = subprocess.run(["crontab", "-l"], capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def _write_crontab(lines: List[str]) -> bool:
+    """Replace the user crontab with the non-blank lines given"""
+    new_cron = "\n".join(line for line in lines if line.strip())
+    if new_cron and not new_cron.endswith("\n"):
+        new_cron += "\n"
+    result = subprocess.run(
+        ["crontab", "-"], input=new_cron, capture_output=True, text=True
+    )
+    return result.returncode == 0
+
+
 def setup_general_cronjob() -> bool:
-    """Setup single general cronjob that handles all models dynamically"""
+    """Setup the scheduler process that handles all models dynamically"""
     try:
         project_root, python_path = get_project_paths()
         script_path = f"{project_root}/runpod_cronjob.py"
+        log_path = f"{project_root}/runpod_cronjob.log"
+
+        # The scheduler sleeps until the next due model; cron only restarts it
+        # after a reboot. Use full absolute paths for reliable execution
+        cron_command = (
+            f"@reboot {python_path} {script_path} >> {log_path} 2>&1 # runpod_scheduler"
+        )
 
-        # Single cronjob runs every minute but script handles individual model schedules
-        # Use full absolute paths for reliable execution (no cd needed)
-        cron_command = f"*/1 * * * * {python_path} {script_path} >> {project_root}/runpod_cronjob.log 2>&1 # runpod_scheduler"
+        with _crontab_lock():
+            # Get current crontab
+            current_cron = _read_crontab() or ""
 
-        # Get current crontab
-        try:
-            current_cron = subprocess.check_output(
-                ["crontab", "-l"], stderr=subprocess.DEVNULL
-            ).decode()
-        except subprocess.CalledProcessError:
-            current_cron = ""
-
-        # Remove existing RunPod cronjobs completely to prevent duplicates
-        lines = []
-        for line in current_cron.split("\n"):
-            if line.strip() and not (
-                "runpod_cronjob.py" in line or "runpod_scheduler" in line
-            ):
-                lines.append(line)
-
-        # Check if this exact cronjob already exists to prevent duplicates
-        if cron_command.split(" # ")[0] not in [line.split(" # ")[0] for line in lines]:
-            lines.append(cron_command)
-
-        # Update crontab
-        new_cron = "\n".join([line for line in lines if line.strip()])
-        if new_cron and not new_cron.endswith("\n"):
-            new_cron += "\n"
-        process = subprocess.Popen(["crontab", "-"], stdin=subprocess.PIPE, text=True)
-        process.communicate(input=new_cron)
-
-        return process.returncode == 0
+            # Remove existing RunPod cronjobs completely to prevent duplicates
+            lines = []
+            for line in current_cron.split("\n"):
+                if line.strip() and not (
+                    "runpod_cronjob.py" in line or "runpod_scheduler" in line
+                ):
+                    lines.append(line)
+
+            # Check if this exact cronjob already exists to prevent duplicates
+            existing = {line.split(" # ", 1)[0] for line in lines}
+            if cron_command.split(" # ", 1)[0] not in existing:
+                lines.append(cron_command)
+
+            if not _write_crontab(lines):
+                return False
+
+        ensure_scheduler_running(python_path, script_path, log_path)
+        return True
     except Exception as e:
         print(f"Error setting up general cronjob: {e}")
         return False
@@ -69,14 +160,6 @@ def setup_general_cronjob() -> bool:
 def test_immediate_cronjob(model_name: str) -> bool:
     """Test single model immediately regardless of time settings"""
     try:
-        from datetime import datetime
-
-        import pytz
-
-        from core.runpod_api import make_runpod_request
-        from core.scheduler_manager import get_model_config
-        from utils.slack_utils import send_slack_notification_immediate
-
         # Get model configuration
         model_config = get_model_config(model_name)
         if not model_config:
@@ -90,27 +173,20 @@ def test_immediate_cronjob(model_name: str) -> bool:
         result = make_runpod_request(
             target_url, model_name, f"Initial test - {model_name}"
         )
+        flush_config()
         success = result.get("success", False)
 
         # Send Slack notification for immediate test
         if success:
-            from core.env_settings import DEFAULT_TIMEZONE
-
-            tz = pytz.timezone(DEFAULT_TIMEZONE)
-            call_time = datetime.now(tz)
+            call_time = datetime.now(TZ)
             interval_minutes = model_config.get("interval_minutes", 1)
             from_time = model_config.get("from_time", "08:30:00")
             to_time = model_config.get("to_time", "17:30:00")
 
-            from core.env_settings import get_timezone_abbreviation
-
             tz_abbr = get_timezone_abbreviation()
-            # Import the utility function
-            import os
-            import sys
-
-            script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            sys.path.insert(0, script_dir)
+            # Imported lazily: runpod_cronjob imports this module at load time
+            if PROJECT_ROOT not in sys.path:
+                sys.path.insert(0, PROJECT_ROOT)
             from runpod_cronjob import _extract_endpoint_display
 
             endpoint_display = _extract_endpoint_display(target_url)
@@ -127,41 +203,38 @@ def test_immediate_cronjob(model_name: str) -> bool:
 
 
 def remove_all_cronjobs() -> bool:
-    """Remove all RunPod cronjobs"""
+    """Remove all RunPod cronjobs and stop the scheduler"""
     try:
-        # Get current crontab
-        try:
-            current_cron = subprocess.check_output(
-                ["crontab", "-l"], stderr=subprocess.DEVNULL
-            ).decode()
-        except subprocess.CalledProcessError:
-            return True  # No crontab exists, consider it success
-
-        # Remove all RunPod jobs (both old individual and scheduler)
-        lines = [
-            line
-            for line in current_cron.split("\n")
-            if not any(tag in line for tag in ["# runpod_", "# runpod_scheduler"])
-        ]
-
-        # Update crontab
-        new_cron = "\n".join([line for line in lines if line.strip()])
-        if new_cron and not new_cron.endswith("\n"):
-            new_cron += "\n"
-        process = subprocess.Popen(["crontab", "-"], stdin=subprocess.PIPE, text=True)
-        process.communicate(input=new_cron)
+        stop_scheduler()
+
+        with _crontab_lock():
+            # Get current crontab
+            current_cron = _read_crontab()
+            if current_cron is None:
+                return True  # No crontab exists, consider it success
+
+            # Remove all RunPod jobs (both old individual and scheduler)
+            lines = [
+                line
+                for line in current_cron.split("\n")
+                if not _RUNPOD_TAG_RE.search(line)
+            ]
+            cron_updated = _write_crontab(lines)
 
         # Remove old script files
         try:
             project_root, _ = get_project_paths()
-            import glob
-
-            for script_file in glob.glob(f"{project_root}/cron_runpod_*.py"):
-                os.remove(script_file)
-        except (OSError, FileNotFoundError):
+            with os.scandir(project_root) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith("cron_runpod_") and name.endswith(".py"):
+                        # Another stop may have removed it already
+                        with suppress(FileNotFoundError):
+                            os.unlink(entry.path)
+        except OSError:
             pass
 
-        return process.returncode == 0
+        return cron_updated
     except Exception as e:
         print(f"Error removing cronjobs: {e}")
         return False
@@ -1,57 +1,124 @@
 """Slack notification utilities"""
 
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
-import pytz
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from core.env_settings import (
-    DEFAULT_TIMEZONE,
+    TZ,
     get_slack_bot_token,
     get_slack_config,
     get_slack_mention_user,
     get_timezone_abbreviation,
+    refresh_slack_config,
 )
 
+SLACK_POST_MESSAGE_URL = "https://slack.com/api/chat.postMessage"
+# Payloads are pre-serialized with orjson, so the content type is set by hand
+_JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+# Shared session so bursts of notifications reuse keep-alive connections.
+# A POST is only retried when Slack cannot have posted it: failed connects
+# and 429s (after Retry-After). Read timeouts and 5xx may follow a post that
+# already landed, so retrying them would duplicate alerts
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            read=0,
+            other=0,
+            backoff_factor=0.2,
+            status_forcelist=[429],
+            respect_retry_after_header=True,
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        ),
+    ),
+)
+
+
+# Background sender so notifications never hold up RunPod calls. Shared by
+# every tick of the scheduler and drained before the process exits. A single
+# worker posts in queue order, so a model's startup notice always precedes
+# its cold start result (Slack rate-limits channels to ~1 message/s anyway)
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slack")
+atexit.register(_EXECUTOR.shutdown, wait=True)
+
+
+def queue_notification(send, *args, **kwargs) -> Optional[Future]:
+    """Run a notification sender on the background executor and return at once"""
+    # Every sender is a no-op when Slack is off, so skip the thread hop too
+    if not get_slack_config().get("enabled", False):
+        return None
+    return _EXECUTOR.submit(send, *args, **kwargs)
+
+
+def refresh_slack_settings() -> None:
+    """Pick up Slack settings changed in .env since they were first read"""
+    refresh_slack_config()
+    _bot_headers.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _bot_headers() -> Dict[str, str]:
+    """Build the Web API auth headers (once per process)"""
+    return {**_JSON_HEADERS, "Authorization": f"Bearer {get_slack_bot_token()}"}
+
+
+# Mention syntax keyed by the first character of the Slack ID
+_MENTION_FMT = {
+    "S": "<!subteam^{0}>",  # User group
+    "U": "<@{0}>",  # Individual user
+}
+_DEFAULT_MENTION_FMT = "<!{0}>"  # Channel mentions (here, channel, etc.)
+
 
 def _format_slack_mention(mention_user: str) -> str:
     """Format Slack mention based on user ID type"""
-    if mention_user.startswith("S"):
-        return f"<!subteam^{mention_user}>"  # User group
-    elif mention_user.startswith("U"):
-        return f"<@{mention_user}>"  # Individual user
-    else:
-        return f"<!{mention_user}>"  # Channel mentions (here, channel, etc.)
+    return _MENTION_FMT.get(mention_user[:1], _DEFAULT_MENTION_FMT).format(mention_user)
+
+
+def _blocks_payload(slack_config, blocks):
+    """Build a Block Kit message payload with the configured sender identity"""
+    return {
+        "channel": slack_config.get("channel", "#runpod-alerts"),
+        "username": slack_config.get("username", "RunPod Supervisor"),
+        "icon_emoji": slack_config.get("icon_emoji", ":robot_face:"),
+        "blocks": blocks,
+    }
 
 
 def send_failure_notification_with_thread(message, model_name):
     """Send failure notification via Web API and return message timestamp for threading"""
     try:
-        bot_token = get_slack_bot_token()
+        headers = _bot_headers()
         slack_config = get_slack_config()
 
         if not slack_config.get("enabled", False):
             return None
 
-        channel = slack_config.get("channel", "#runpod-alerts")
-
         # Create failure message blocks
         blocks = create_beautiful_message_blocks(
             message, is_success=False, message_type="regular"
         )
+        payload = _blocks_payload(slack_config, blocks)
 
-        payload = {
-            "channel": channel,
-            "blocks": blocks,
-            "username": slack_config.get("username", "RunPod Supervisor"),
-            "icon_emoji": slack_config.get("icon_emoji", ":robot_face:"),
-        }
-
-        headers = {"Authorization": f"Bearer {bot_token}"}
-        response = requests.post(
-            "https://slack.com/api/chat.postMessage",
+        response = _SESSION.post(
+            SLACK_POST_MESSAGE_URL,
             headers=headers,
-            json=payload,
+            data=orjson.dumps(payload),
             timeout=10,
         )
 
@@ -77,7 +144,7 @@ def send_mention_notification(
 ):
     """Send mention notification using Bot Token, optionally as a thread reply"""
     try:
-        bot_token = get_slack_bot_token()
+        headers = _bot_headers()
         slack_config = get_slack_config()
 
         if not slack_config.get("enabled", False):
@@ -102,11 +169,10 @@ def send_mention_notification(
         if thread_ts:
             payload["thread_ts"] = thread_ts
 
-        headers = {"Authorization": f"Bearer {bot_token}"}
-        response = requests.post(
-            "https://slack.com/api/chat.postMessage",
+        response = _SESSION.post(
+            SLACK_POST_MESSAGE_URL,
             headers=headers,
-            json=payload,
+            data=orjson.dumps(payload),
             timeout=60,
         )
 
@@ -126,25 +192,23 @@ def send_mention_notification(
 
 def send_slack_notification_immediate(message, is_success=True, message_type="regular"):
     """Send beautifully formatted slack notification using Block Kit"""
-    try:
-        slack_config = get_slack_config()
-
-        if not slack_config.get("enabled", False) or not slack_config.get(
-            "webhook_url"
-        ):
-            return
+    # Cached config, so a disabled Slack returns before any other work
+    slack_config = get_slack_config()
+    if not slack_config.get("enabled", False) or not slack_config.get("webhook_url"):
+        return
 
+    try:
         # Create beautiful block-based message
         blocks = create_beautiful_message_blocks(message, is_success, message_type)
 
-        payload = {
-            "channel": slack_config.get("channel", "#runpod-alerts"),
-            "username": slack_config.get("username", "RunPod Supervisor"),
-            "icon_emoji": slack_config.get("icon_emoji", ":robot_face:"),
-            "blocks": blocks,
-        }
+        payload = _blocks_payload(slack_config, blocks)
 
-        response = requests.post(slack_config["webhook_url"], json=payload, timeout=10)
+        response = _SESSION.post(
+            slack_config["webhook_url"],
+            headers=_JSON_HEADERS,
+            data=orjson.dumps(payload),
+            timeout=10,
+        )
         if response.status_code == 200:
             print(f"Slack notification sent: {message[:50]}...")
         else:
@@ -153,127 +217,96 @@ def send_slack_notification_immediate(message, is_success=True, message_type="re
         print(f"Slack notification error: {e}")
 
 
+def _image(name: str, alt_text: str) -> Dict[str, str]:
+    """Build a section accessory showing one of the icons8 status icons"""
+    return {
+        "type": "image",
+        "image_url": f"https://img.icons8.com/color/32/000000/{name}.png",
+        "alt_text": alt_text,
+    }
+
+
+def _header(text: str) -> Dict[str, Any]:
+    """Build a plain-text header block"""
+    return {"type": "header", "text": {"type": "plain_text", "text": text}}
+
+
+def _section(text: str, accessory: Dict[str, str]) -> Dict[str, Any]:
+    """Build a mrkdwn section block with an icon accessory"""
+    return {
+        "type": "section",
+        "text": {"type": "mrkdwn", "text": text},
+        "accessory": accessory,
+    }
+
+
+def _context(text: str) -> Dict[str, Any]:
+    """Build a single-line mrkdwn context block"""
+    return {"type": "context", "elements": [{"type": "mrkdwn", "text": text}]}
+
+
+# Constant blocks are built once and shared; only message text is per call.
+# Slack payloads are serialized, never mutated, so sharing is safe
+_DIVIDER = {"type": "divider"}
+_STARTUP_HEADER = _header("🚀 Serverless Instance Started")
+_SHUTDOWN_HEADER = _header("🛑 Daily Operation Ended")
+_RESULT_HEADERS = {
+    True: _header("✅ API Call Successful"),
+    False: _header("❌ API Call Failed"),
+}
+_STARTUP_IMAGE = _image("rocket", "startup")
+_SHUTDOWN_IMAGE = _image("shutdown", "shutdown")
+_TEST_IMAGE = _image("test-tube", "test")
+_RESULT_IMAGES = {
+    True: _image("checkmark", "success"),
+    False: _image("cancel", "failed"),
+}
+
+
 def create_beautiful_message_blocks(message, is_success, message_type):
     """Create beautiful Slack message blocks"""
 
     if message_type == "startup":
         # 🚀 Startup message
         return [
-            {"type": "divider"},
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "🚀 Serverless Instance Started",
-                },
-            },
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": message},
-                "accessory": {
-                    "type": "image",
-                    "image_url": "https://img.icons8.com/color/32/000000/rocket.png",
-                    "alt_text": "startup",
-                },
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"🕐 Started at {datetime.now(pytz.timezone(DEFAULT_TIMEZONE)).strftime('%H:%M:%S')} {get_timezone_abbreviation()}",
-                    }
-                ],
-            },
-            {"type": "divider"},
+            _DIVIDER,
+            _STARTUP_HEADER,
+            _section(message, _STARTUP_IMAGE),
+            _context(
+                f"🕐 Started at {datetime.now(TZ).strftime('%H:%M:%S')} {get_timezone_abbreviation()}"
+            ),
+            _DIVIDER,
         ]
 
     elif message_type == "shutdown":
         # 🛑 Shutdown message
         return [
-            {"type": "divider"},
-            {
-                "type": "header",
-                "text": {"type": "plain_text", "text": "🛑 Daily Operation Ended"},
-            },
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": message},
-                "accessory": {
-                    "type": "image",
-                    "image_url": "https://img.icons8.com/color/32/000000/shutdown.png",
-                    "alt_text": "shutdown",
-                },
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"🛌 See you tomorrow! Next start: 07:30:00 {get_timezone_abbreviation()}",
-                    }
-                ],
-            },
-            {"type": "divider"},
+            _DIVIDER,
+            _SHUTDOWN_HEADER,
+            _section(message, _SHUTDOWN_IMAGE),
+            _context(
+                f"🛌 See you tomorrow! Next start: 07:30:00 {get_timezone_abbreviation()}"
+            ),
+            _DIVIDER,
         ]
 
     elif message_type == "test":
         # 🧪 Initial test message
         return [
-            {"type": "divider"},
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"🧪 *Initial Test Successful*\n{message}",
-                },
-                "accessory": {
-                    "type": "image",
-                    "image_url": "https://img.icons8.com/color/32/000000/test-tube.png",
-                    "alt_text": "test",
-                },
-            },
-            {"type": "divider"},
+            _DIVIDER,
+            _section(f"🧪 *Initial Test Successful*\n{message}", _TEST_IMAGE),
+            _DIVIDER,
         ]
 
     else:
         # Regular API success message - more compact and clean
-        status_emoji = "✅" if is_success else "❌"
-        icon_url = (
-            "https://img.icons8.com/color/32/000000/checkmark.png"
-            if is_success
-            else "https://img.icons8.com/color/32/000000/cancel.png"
-        )
-
+        is_success = bool(is_success)
         return [
-            {"type": "divider"},
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"{status_emoji} API Call {'Successful' if is_success else 'Failed'}",
-                },
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": message,
-                },
-                "accessory": {
-                    "type": "image",
-                    "image_url": icon_url,
-                    "alt_text": "success" if is_success else "failed",
-                },
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"⚡ Scheduled execution • {datetime.now(pytz.timezone(DEFAULT_TIMEZONE)).strftime('%H:%M:%S')} {get_timezone_abbreviation()}",
-                    }
-                ],
-            },
-            {"type": "divider"},
+            _DIVIDER,
+            _RESULT_HEADERS[is_success],
+            _section(message, _RESULT_IMAGES[is_success]),
+            _context(
+                f"⚡ Scheduled execution • {datetime.now(TZ).strftime('%H:%M:%S')} {get_timezone_abbreviation()}"
+            ),
+            _DIVIDER,
         ]
@@ -1,14 +1,17 @@
 """RunPod Serverless Supervisor - Streamlit Web Interface"""
 
-import pandas as pd
+from typing import TYPE_CHECKING
+
 import streamlit as st
 
 from core.env_settings import (
+    AUTO_REFRESH_SECONDS,
     AVAILABLE_MODELS,
     DEFAULT_FROM_TIME,
     DEFAULT_INTERVAL,
     DEFAULT_TO_TIME,
     MAX_INTERVAL,
+    TZ,
 )
 from core.scheduler_manager import deactivate_model, get_active_models, set_model_config
 from utils.cronjob_utils import (
@@ -17,28 +20,136 @@ from utils.cronjob_utils import (
     test_immediate_cronjob,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Longest status table sent to the browser in one render
+MAX_DISPLAY_ROWS = 200
+# Built once at import instead of on every rerun
+MODEL_TUPLE = tuple(AVAILABLE_MODELS)
+_COLUMN_CONFIG = {
+    "Model": st.column_config.TextColumn("Model", width="medium"),
+    "Status": st.column_config.TextColumn("Status", width="small"),
+    "URL": st.column_config.TextColumn("URL", width="large"),  # Make URL column larger
+    "From": st.column_config.TextColumn("From", width="small"),
+    "To": st.column_config.TextColumn("To", width="small"),
+    "Interval": st.column_config.TextColumn("Interval", width="small"),
+    "Started": st.column_config.TextColumn("Started", width="medium"),
+}
+# Status column labels; any other stored status (e.g. "testing") shows as stopped
+_STATUS_STOPPED = "🔴 Stopped"
+_STATUS_MAP = {"running": "🟢 Running", "error": "⚠️ Error"}
+
 # Page config
 st.set_page_config(page_title="RunPod Serverless Supervisor", layout="wide")
 
 
-# Title with refresh button - same horizontal line
-col1, col2 = st.columns([10, 1])
-with col1:
-    st.title("⏰ RunPod Supervisor")
-with col2:
-    st.markdown(
-        "<div style='margin-top: 1rem; text-align: right;'>", unsafe_allow_html=True
+def _set_msg(kind, text):
+    """Queue a message to show after the next rerun"""
+    st.session_state.message = (kind, text)
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _build_target_url(url: str) -> str:
+    """Normalize an endpoint ID or URL to the OpenAI chat completions endpoint"""
+    url = url.strip()
+    if not url:
+        return ""
+    if url.startswith("https://"):
+        return url
+    return f"https://api.runpod.ai/v2/{url}/openai/v1/chat/completions"
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _cached_active_models():
+    """Active model configs, shared by reruns within a few seconds"""
+    return get_active_models()
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _build_status_df(configs_items: tuple) -> "pd.DataFrame":
+    """Build the status table; configs_items is sorted active_configs.items()"""
+    # pandas is only needed here, so the page above the table renders before
+    # the first import is paid (later reruns hit sys.modules)
+    import pandas as pd
+
+    active_configs = dict(configs_items)
+
+    # One list per column, filled by position, so pandas builds each column once
+    n_models = len(MODEL_TUPLE)
+    status_col = [_STATUS_STOPPED] * n_models
+    url_col = [""] * n_models
+    from_col = [""] * n_models
+    to_col = [""] * n_models
+    interval_col = [""] * n_models
+    started_raw = [""] * n_models
+    # Holds the lists themselves, so the loop below fills these columns in place
+    columns = {
+        "Model": MODEL_TUPLE,
+        "Status": status_col,
+        "URL": url_col,
+        "From": from_col,
+        "To": to_col,
+        "Interval": interval_col,
+    }
+    if not active_configs:
+        # Idle state: every row keeps the stopped defaults, nothing to parse
+        return pd.DataFrame({**columns, "Started": started_raw})
+
+    for i, model in enumerate(MODEL_TUPLE):
+        model_config = active_configs.get(model)
+        if not model_config:
+            continue
+
+        # Get status from config
+        model_status = model_config.get("status", "running")
+        status_col[i] = _STATUS_MAP.get(model_status, _STATUS_STOPPED)
+
+        url_col[i] = model_config.get("target_url", "")
+        # Format time displays (HH:MM only); stored as zero-padded HH:MM:SS
+        from_col[i] = (model_config.get("from_time") or "")[:5]
+        to_col[i] = (model_config.get("to_time") or "")[:5]
+        interval_col[i] = f"{model_config.get('interval_minutes', 0)} min"
+        # Started time is formatted for the whole column after the loop
+        started_raw[i] = model_config.get("last_updated") or ""
+
+    df = pd.DataFrame(columns)
+    # Timestamps are stored in TZ; unparsable ones fall back to the raw text
+    raw = pd.Series(started_raw, dtype="object")
+    started = pd.to_datetime(raw, utc=True, errors="coerce", format="ISO8601")
+    df["Started"] = (
+        started.dt.tz_convert(TZ)
+        .dt.strftime("%y/%m/%d %H:%M:%S")
+        .where(started.notna(), raw.str[:19])
     )
-    if st.button("🔄 Refresh", key="top_refresh", use_container_width=True):
-        st.rerun()
-    st.markdown("</div>", unsafe_allow_html=True)
+    return df
+
+
+@st.fragment
+def _header():
+    """Title with refresh button - same horizontal line"""
+    col1, col2 = st.columns([10, 1])
+    with col1:
+        st.title("⏰ RunPod Supervisor")
+    with col2:
+        st.markdown(
+            "<div style='margin-top: 1rem; text-align: right;'>",
+            unsafe_allow_html=True,
+        )
+        # st.rerun() from a fragment still reruns the whole page
+        if st.button("🔄 Refresh", key="top_refresh", use_container_width=True):
+            st.rerun()
+        st.markdown("</div>", unsafe_allow_html=True)
+
+
+_header()
 
 # Initialize session state for messages
 if "message" not in st.session_state:
     st.session_state.message = None
 
 # Current active models info
-active_configs = get_active_models()
+active_configs = _cached_active_models()
 total_active = len(active_configs)
 
 if total_active > 0:
@@ -49,31 +160,50 @@ else:
 st.markdown("---")
 st.markdown("### ⏰ Time Settings")
 
-# Time settings
-col1, col2, col3 = st.columns(3)
 
-with col1:
-    st.markdown("##### From")
-    from_time = st.time_input(
-        "From", value=DEFAULT_FROM_TIME, label_visibility="collapsed", step=60
-    )
+@st.fragment
+def _time_settings():
+    """Time inputs; editing them reruns only this fragment until START/STOP"""
+    col1, col2, col3 = st.columns(3)
 
-with col2:
-    st.markdown("##### To")
-    to_time = st.time_input(
-        "To", value=DEFAULT_TO_TIME, label_visibility="collapsed", step=60
-    )
+    with col1:
+        st.markdown("##### From")
+        st.time_input(
+            "From",
+            value=DEFAULT_FROM_TIME,
+            label_visibility="collapsed",
+            step=60,
+            key="from_time",
+        )
 
-with col3:
-    st.markdown("##### Interval (min)")
-    interval_value = st.number_input(
-        "Interval",
-        min_value=30,
-        max_value=MAX_INTERVAL,
-        value=DEFAULT_INTERVAL,
-        label_visibility="collapsed",
-        help=f"Maximum configurable time interval is 24 hours ({MAX_INTERVAL} minutes).",
-    )
+    with col2:
+        st.markdown("##### To")
+        st.time_input(
+            "To",
+            value=DEFAULT_TO_TIME,
+            label_visibility="collapsed",
+            step=60,
+            key="to_time",
+        )
+
+    with col3:
+        st.markdown("##### Interval (min)")
+        st.number_input(
+            "Interval",
+            min_value=30,
+            max_value=MAX_INTERVAL,
+            value=DEFAULT_INTERVAL,
+            label_visibility="collapsed",
+            help=f"Maximum configurable time interval is 24 hours ({MAX_INTERVAL} minutes).",
+            key="interval_value",
+        )
+
+
+# Time settings, read back from the widget keys for the START handler
+_time_settings()
+from_time = st.session_state.from_time
+to_time = st.session_state.to_time
+interval_value = st.session_state.interval_value
 
 st.markdown("---")
 
@@ -81,16 +211,8 @@ st.markdown("---")
 st.markdown("### 🎮 Control Panel")
 
 url = st.text_input("Target URL", placeholder="Your RunPod endpoint ID")
-# Ensure consistent URL format for OpenAI chat completions endpoint
-if url:
-    url = url.strip()
-    if url.startswith("https://"):
-        target_url = url
-    else:
-        target_url = f"https://api.runpod.ai/v2/{url}/openai/v1/chat/completions"
-else:
-    target_url = ""
-model_repo = st.selectbox("Model", options=AVAILABLE_MODELS, index=0)
+target_url = _build_target_url(url)
+model_repo = st.selectbox("Model", options=MODEL_TUPLE, index=0)
 run_initial_test = st.checkbox(
     "Run initial test after setup",
     value=False,
@@ -107,7 +229,7 @@ with col1:
 
 # Handle start button
 if start_pressed:
-    if url and model_repo:
+    if target_url and model_repo:
         # Save config with "running" status directly
         config_success = set_model_config(
             model_name=model_repo,
@@ -118,6 +240,7 @@ if start_pressed:
             active=True,
             status="running",
         )
+        _cached_active_models.clear()
 
         if config_success:
             # Setup single general cronjob (handles all models)
@@ -129,29 +252,26 @@ if start_pressed:
                     test_success = test_immediate_cronjob(model_repo)
 
                     if test_success:
-                        st.session_state.message = (
+                        _set_msg(
                             "success",
                             f"✅ Started {model_repo} - Initial test successful! Running every {interval_value} minutes from {from_time.strftime('%H:%M')} to {to_time.strftime('%H:%M')}",
                         )
                     else:
-                        st.session_state.message = (
+                        _set_msg(
                             "warning",
                             f"⚠️ Started {model_repo} but initial test failed - Check your endpoint URL",
                         )
                 else:
-                    st.session_state.message = (
+                    _set_msg(
                         "success",
                         f"✅ Started {model_repo}! Running every {interval_value} minutes from {from_time.strftime('%H:%M')} to {to_time.strftime('%H:%M')}",
                     )
             else:
-                st.session_state.message = (
-                    "error",
-                    "❌ Failed to setup cronjob system",
-                )
+                _set_msg("error", "❌ Failed to setup cronjob system")
         else:
-            st.session_state.message = ("error", "Failed to save config")
+            _set_msg("error", "Failed to save config")
     else:
-        st.session_state.message = ("error", "Please enter URL and select model")
+        _set_msg("error", "Please enter URL and select model")
     st.rerun()
 
 with col2:
@@ -163,11 +283,11 @@ with col2:
 if stop_pressed:
     if model_repo:
         # Remove from config (but keep general cronjob for other active models)
-        config_success = deactivate_model(model_repo)
+        config_success, active_configs = deactivate_model(model_repo)
+        _cached_active_models.clear()
 
-        # Check if there are any other active models
-        active_configs = get_active_models()
-        has_other_active = any(m != model_repo for m in active_configs)
+        # The stopped model is already excluded from the remaining active set
+        has_other_active = bool(active_configs)
 
         cronjob_success = True
         if not has_other_active:
@@ -176,17 +296,14 @@ if stop_pressed:
 
         if config_success:
             if has_other_active:
-                st.session_state.message = (
+                _set_msg(
                     "success",
                     f"⏹️ Stopped {model_repo} (general cronjob still running for other models)",
                 )
             else:
-                st.session_state.message = (
-                    "success",
-                    f"⏹️ Stopped {model_repo} and removed all cronjobs",
-                )
+                _set_msg("success", f"⏹️ Stopped {model_repo} and removed all cronjobs")
         else:
-            st.session_state.message = ("error", "Failed to stop")
+            _set_msg("error", "Failed to stop")
     st.rerun()
 
 
@@ -208,74 +325,35 @@ st.markdown("---")
 # Status table
 st.markdown("### 🏃🏻 Status")
 
-table_data = []
-for model in AVAILABLE_MODELS:
-    model_config = active_configs.get(model)
 
-    if model_config:
-        # Get status from config
-        model_status = model_config.get("status", "running")
-        if model_status == "running":
-            status = "🟢 Running"
-        elif model_status == "error":
-            status = "⚠️ Error"
-        else:
-            status = "🔴 Stopped"
-
-        target_url_display = model_config.get("target_url", "")
-        # Format time displays (HH:MM only)
-        from_time_display = ":".join(model_config.get("from_time", "").split(":")[:2])
-        to_time_display = ":".join(model_config.get("to_time", "").split(":")[:2])
-        interval_display = f"{model_config.get('interval_minutes', 0)} min"
-
-        # Format started time
-        started_time = model_config.get("last_updated", "")
-        if started_time:
-            try:
-                from datetime import datetime
-
-                dt = datetime.fromisoformat(started_time.replace("Z", "+00:00"))
-                started_display = dt.strftime("%y/%m/%d %H:%M:%S")
-            except (ValueError, AttributeError):
-                started_display = (
-                    started_time[:19] if len(started_time) >= 19 else started_time
-                )
-        else:
-            started_display = ""
-    else:
-        status = "🔴 Stopped"
-        target_url_display = ""
-        from_time_display = ""
-        to_time_display = ""
-        interval_display = ""
-        started_display = ""
-
-    table_data.append(
-        {
-            "Model": model,
-            "Status": status,
-            "URL": target_url_display,
-            "From": from_time_display,
-            "To": to_time_display,
-            "Interval": interval_display,
-            "Started": started_display,
-        }
+@st.fragment(run_every=AUTO_REFRESH_SECONDS)
+def render_status_table():
+    """Status table, refreshed on its own timer without rerunning the page"""
+    active_configs = _cached_active_models()
+    configs_items = tuple(sorted(active_configs.items()))
+    # Unchanged configs reuse this session's table without even a cache lookup
+    configs_hash = hash(tuple((m, tuple(sorted(c.items()))) for m, c in configs_items))
+    if st.session_state.get("tbl_hash") != configs_hash:
+        # pyarrow ships with streamlit; only imported once a table is rebuilt
+        import pyarrow as pa
+
+        df = _build_status_df(configs_items)
+        # Converted to Arrow once here, so unchanged reruns skip the pandas step
+        st.session_state.tbl_table = pa.Table.from_pandas(
+            df.head(MAX_DISPLAY_ROWS), preserve_index=False
+        )
+        st.session_state.tbl_rows = len(df)
+        st.session_state.tbl_hash = configs_hash
+    # Plain table, never a Styler: the styled render path is the slow one
+    st.dataframe(
+        st.session_state.tbl_table,
+        use_container_width=True,
+        hide_index=True,
+        column_config=_COLUMN_CONFIG,
     )
+    total_rows = st.session_state.tbl_rows
+    if total_rows > MAX_DISPLAY_ROWS:
+        st.caption(f"Showing first {MAX_DISPLAY_ROWS} of {total_rows} models")
 
-df = pd.DataFrame(table_data)
-st.dataframe(
-    df,
-    use_container_width=True,
-    hide_index=True,
-    column_config={
-        "Model": st.column_config.TextColumn("Model", width="medium"),
-        "Status": st.column_config.TextColumn("Status", width="small"),
-        "URL": st.column_config.TextColumn(
-            "URL", width="large"
-        ),  # Make URL column larger
-        "From": st.column_config.TextColumn("From", width="small"),
-        "To": st.column_config.TextColumn("To", width="small"),
-        "Interval": st.column_config.TextColumn("Interval", width="small"),
-        "Started": st.column_config.TextColumn("Started", width="medium"),
-    },
-)
+
+render_status_table()